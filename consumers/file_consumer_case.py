@@ -25,45 +25,206 @@ Environment variables are in utils/utils_config module.
 
 # import from standard library
 import json
+import os
 import pathlib
+import sqlite3
 import sys
+import threading
 import time
 
+# import from external packages (optional: fall back to the standard library)
+# Both parsers raise ValueError subclasses on bad input (JSONDecodeError, UnicodeDecodeError).
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# watchdog wakes the consumer as soon as the file changes (optional: fall back to polling)
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
 # import from local modules
 import utils.utils_config as config
 from utils.utils_logger import logger
-from .sqlite_consumer_case import init_db, insert_message
+from .sqlite_consumer_case import init_db, get_conn, close_conn, insert_messages_batch
+
+# Flush processed messages to the database once this many are pending
+BATCH_SIZE = 1000
+
+# Read at most this many bytes of new lines from the file at once
+CHUNK_BYTES = 1 << 22
+
+# Positional read (os.pread is missing on Windows: seek then read instead)
+if hasattr(os, "pread"):
+    _read_at = os.pread
+else:
+
+    def _read_at(fd: int, n: int, offset: int) -> bytes:
+        os.lseek(fd, offset, os.SEEK_SET)
+        return os.read(fd, n)
+
 
 #####################################
 # Function to process a single message
 # #####################################
 
 
-def process_message(message: str) -> None:
+def _process_known(message: dict) -> tuple:
+    """Build a row from a message that has every field (no defaults, no .get())."""
+    return (
+        message["message"],
+        message["author"],
+        message["timestamp"],
+        message["category"],
+        float(message["sentiment"]),
+        message["keyword_mentioned"],
+        int(message["message_length"]),
+    )
+
+
+def process_message(message: dict) -> tuple:
     """
-    Process and transform a single JSON message.
+    Process and transform a single parsed JSON message.
     Converts message fields to appropriate data types.
 
+    Well-formed messages take the fast path in _process_known();
+    messages missing a field fall back to defaults.
+
     Args:
-        message (str): The JSON message as a string.
+        message (dict): The parsed JSON message.
+
+    Returns:
+        tuple: Row values in sqlite_consumer_case.INSERT_COLS order, or None if invalid.
     """
     try:
-        processed_message = {
-            "message": message.get("message"),
-            "author": message.get("author"),
-            "timestamp": message.get("timestamp"),
-            "category": message.get("category"),
-            "sentiment": float(message.get("sentiment", 0.0)),
-            "keyword_mentioned": message.get("keyword_mentioned"),
-            "message_length": int(message.get("message_length", 0)),
-        }
-        logger.info(f"Processed message: {processed_message}")
+        try:
+            processed_message = _process_known(message)
+        except KeyError:
+            processed_message = (
+                message.get("message"),
+                message.get("author"),
+                message.get("timestamp"),
+                message.get("category"),
+                float(message.get("sentiment", 0.0)),
+                message.get("keyword_mentioned"),
+                int(message.get("message_length", 0)),
+            )
+        # Lazy args: loguru skips formatting when DEBUG is below the handler level
+        logger.debug("Processed message: {}", processed_message)
         return processed_message
     except Exception as e:
         logger.error(f"Error processing message: {e}")
         return None
 
 
+#####################################
+# Process a buffer of complete JSON lines
+#####################################
+
+
+def process_buffer(buf: bytes, insert_batch, loads=_json_loads) -> int:
+    """
+    Parse every newline-terminated JSON line in buf and store the rows.
+
+    This is the consumer's inner loop, kept in one function over one bytes
+    buffer so it runs without per-line file calls.
+
+    Args:
+        buf (bytes): Complete lines (the last line ends with a newline).
+        insert_batch (callable): Takes a list of row tuples and returns the number inserted.
+        loads (callable): JSON parser that accepts bytes.
+
+    Returns:
+        int: Number of messages inserted.
+    """
+    messages_read = 0
+
+    # Collect processed messages and insert them in one transaction
+    batch = []
+
+    for line in buf.split(b"\n"):
+        # Only parse lines that have content
+        if not line or line.isspace():
+            continue
+        try:
+            # Parse the raw line (surrounding whitespace is allowed)
+            message = loads(line)
+        except (ValueError, RecursionError) as e:
+            # RecursionError: json.loads on a deeply nested line
+            snippet = line[:50].decode("utf-8", errors="replace")
+            logger.error(f"ERROR: Invalid JSON in line: {snippet}: {e}")
+            continue
+
+        # Call our process_message function
+        processed_message = process_message(message)
+
+        # If we have a processed row, queue it for the database
+        if processed_message:
+            batch.append(processed_message)
+            if len(batch) >= BATCH_SIZE:
+                messages_read += insert_batch(batch)
+                batch = []
+
+    # Flush whatever is left from this buffer
+    messages_read += insert_batch(batch)
+    return messages_read
+
+
+#####################################
+# Watch the Live Data File for Changes
+#####################################
+
+
+class LiveFileHandler(FileSystemEventHandler):
+    """Set an event whenever the live data file is created or modified."""
+
+    def __init__(self, live_data_path: pathlib.Path, changed: threading.Event):
+        super().__init__()
+        self.live_data_path = os.path.abspath(live_data_path)
+        self.changed = changed
+
+    def on_modified(self, event) -> None:
+        if os.path.abspath(event.src_path) == self.live_data_path:
+            self.changed.set()
+
+    on_created = on_modified
+
+
+def start_file_watcher(live_data_path: pathlib.Path, changed: threading.Event):
+    """
+    Start a watchdog observer that sets `changed` when the live data file changes.
+
+    Args:
+    - live_data_path (pathlib.Path): Path to the live data file.
+    - changed (threading.Event): Event to set on each change.
+
+    Returns:
+    - The running Observer, or None if watchdog is unavailable or cannot watch the folder.
+    """
+    if Observer is None:
+        logger.info("watchdog not installed; polling the live data file instead.")
+        return None
+    try:
+        observer = Observer()
+        observer.schedule(
+            LiveFileHandler(live_data_path, changed),
+            os.path.dirname(os.path.abspath(live_data_path)),
+            recursive=False,
+        )
+        observer.start()
+        logger.info(f"Watching {live_data_path} for changes.")
+        return observer
+    except Exception as e:
+        logger.warning(f"Could not watch {live_data_path}, polling instead: {e}")
+        return None
+
+
 #####################################
 # Consume Messages from Live Data File
 #####################################
@@ -71,7 +232,7 @@ def process_message(message: str) -> None:
 
 def consume_messages_from_file(
     live_data_path: pathlib.Path,
-    sql_path: pathlib.Path,
+    conn: sqlite3.Connection,
     interval_secs: int,
     last_position: int,
 ):
@@ -81,13 +242,14 @@ def consume_messages_from_file(
 
     Args:
     - live_data_path (pathlib.Path): Path to the live data file.
-    - sql_path (pathlib.Path): Path to the SQLite database file.
+    - conn (sqlite3.Connection): Persistent connection to the SQLite database.
     - interval_secs (int): Interval in seconds to check for new messages.
+      With watchdog installed, this is only the fallback wait between change events.
     - last_position (int): Last read position in the file.
     """
     logger.info("Called consume_messages_from_file() with:")
     logger.info(f"   {live_data_path=}")
-    logger.info(f"   {sql_path=}")
+    logger.info(f"   {conn=}")
     logger.info(f"   {interval_secs=}")
     logger.info(f"   {last_position=}")
 
@@ -98,62 +260,122 @@ def consume_messages_from_file(
     # logger.info("2. Set the last position to 0 to start at the beginning of the file.")
     # last_position = 0
 
-    while True:
-        try:
-            logger.info(f"3. Read from live data file at position {last_position}.")
-            with open(live_data_path, "r") as file:
-                # Move to the last read position
-                file.seek(last_position)
+    # Wake on file-change events when possible; otherwise sleep the full interval
+    changed = threading.Event()
+    observer = start_file_watcher(live_data_path, changed)
 
-                # Initialize a counter for messages read in this iteration
-                messages_read = 0
+    def wait_for_change() -> None:
+        if observer is None:
+            time.sleep(interval_secs)
+        else:
+            changed.wait(interval_secs)
+            changed.clear()
 
-                for line in file:
-                    # If we strip whitespace and there is content
-                    if line.strip():
-                        try:
-                            # Use json.loads to parse the stripped line
-                            message = json.loads(line.strip())
+    try:
+        _consume_loop(live_data_path, conn, interval_secs, last_position, wait_for_change)
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
 
-                            # Call our process_message function
-                            processed_message = process_message(message)
 
-                            # If we have a processed message, insert it into the database
-                            if processed_message:
-                                insert_message(processed_message, sql_path)
-                                messages_read += 1
+def _consume_loop(
+    live_data_path: pathlib.Path,
+    conn: sqlite3.Connection,
+    interval_secs: int,
+    last_position: int,
+    wait_for_change,
+):
+    """
+    Read and store new messages forever, calling wait_for_change() between reads.
+
+    The live data file stays open across reads. New bytes are read from
+    last_position in chunks and the complete lines in them are handed to
+    process_buffer(). The file is reopened from the start if the producer
+    replaces (new inode) or truncates it; a truncate during a read just
+    ends that read early.
+    """
+    fd = None
 
-                        except json.JSONDecodeError as e:
-                            logger.error(
-                                f"ERROR: Invalid JSON in line: {line[:50]}: {e}"
-                            )
-                            continue
+    def insert_batch(rows: list) -> int:
+        return insert_messages_batch(rows, conn)
 
-                # Update the last position that's been read to the current file position
-                last_position = file.tell()
+    def close_file() -> None:
+        nonlocal fd
+        if fd is not None:
+            os.close(fd)
+            fd = None
+
+    try:
+        while True:
+            try:
+                st = os.stat(live_data_path)
+
+                # Reopen if the file was replaced or truncated since the last read
+                if fd is not None:
+                    if st.st_ino != os.fstat(fd).st_ino or st.st_size < last_position:
+                        logger.info("Live data file was replaced or truncated; reopening.")
+                        close_file()
+                        last_position = 0
+
+                # Nothing new since the last read: skip reading entirely
+                if st.st_size == last_position:
+                    wait_for_change()
+                    continue
+
+                if fd is None:
+                    fd = os.open(live_data_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+
+                logger.debug("3. Read from live data file at position {}.", last_position)
+
+                # Initialize a counter for messages read in this iteration
+                messages_read = 0
+
+                # Process complete lines in chunks; a partially written last line
+                # stays unread (from last_position) until its newline arrives
+                size = st.st_size
+                pos = last_position
+                buf = b""
+                while pos < size:
+                    data = _read_at(fd, min(CHUNK_BYTES, size - pos), pos)
+                    if not data:
+                        break  # truncated since the stat
+                    pos += len(data)
+                    buf = buf + data if buf else data
+                    end = buf.rfind(b"\n")
+                    if end == -1:
+                        continue  # a line longer than one chunk: keep reading
+                    messages_read += process_buffer(buf[:end + 1], insert_batch)
+                    last_position += end + 1
+                    buf = buf[end + 1:]
 
                 if messages_read > 0:
                     logger.info(
                         f"Processed {messages_read} message(s). New position: {last_position}"
                     )
 
-        except FileNotFoundError:
-            logger.warning(
-                f"Live data file not found at {live_data_path}. "
-                f"Waiting {interval_secs} seconds for producer to create file..."
-            )
-            time.sleep(interval_secs)
-            continue
-        except Exception as e:
-            logger.error(
-                f"ERROR: Error reading from live data file: {e}\n"
-                f"  Waiting {interval_secs} seconds before retry..."
-            )
-            time.sleep(interval_secs)
-            continue
-
-        # Sleep before checking for new messages again
-        time.sleep(interval_secs)
+            except FileNotFoundError:
+                logger.warning(
+                    f"Live data file not found at {live_data_path}. "
+                    f"Waiting {interval_secs} seconds for producer to create file..."
+                )
+                if fd is not None:
+                    close_file()
+                    last_position = 0
+                wait_for_change()
+                continue
+            except Exception as e:
+                logger.error(
+                    f"ERROR: Error reading from live data file: {e}\n"
+                    f"  Waiting {interval_secs} seconds before retry..."
+                )
+                time.sleep(interval_secs)
+                continue
+
+            # Wait for the producer to append more messages
+            wait_for_change()
+    finally:
+        close_file()
 
 
 #####################################
@@ -210,14 +432,22 @@ def main():
         logger.error(f"ERROR: Failed to create db table: {e}")
         sys.exit(3)
 
-    logger.info("STEP 4. Begin consuming and storing messages.")
+    logger.info("STEP 4. Open a persistent database connection.")
+    try:
+        conn = get_conn(sqlite_path)
+    except Exception as e:
+        logger.error(f"ERROR: Failed to connect to the database: {e}")
+        sys.exit(4)
+
+    logger.info("STEP 5. Begin consuming and storing messages.")
     try:
-        consume_messages_from_file(live_data_path, sqlite_path, interval_secs, 0)
+        consume_messages_from_file(live_data_path, conn, interval_secs, 0)
     except KeyboardInterrupt:
         logger.warning("Consumer interrupted by user.")
     except Exception as e:
         logger.error(f"ERROR: Unexpected error: {e}")
     finally:
+        close_conn(sqlite_path)
         logger.info("TRY/FINALLY: Consumer shutting down.")
 
 
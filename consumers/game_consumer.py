@@ -1,10 +1,19 @@
 import os
 import json
-from collections import deque, defaultdict
+import argparse
+from collections import Counter
+from itertools import chain
 from dotenv import load_dotenv
+import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 
+# Stream events one at a time when ijson is available
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 # ----------------------------
 # Load environment variables
 # ----------------------------
@@ -20,24 +29,25 @@ data_file_path = os.path.join(DATA_DIR, LIVE_DATA_FILE)
 # Load events with validation
 # ----------------------------
 def load_game_events(file_path):
+    """Yield valid events from a JSON array file, parsing one event at a time."""
     if not os.path.exists(file_path):
         print(f"[ERROR] JSON file not found: {file_path}")
-        return []
+        return
 
+    valid_count = 0
     try:
-        with open(file_path, "r") as f:
-            events = json.load(f)
-        valid_events = []
-        for e in events:
-            if "team" in e and "player" in e and "points_scored" in e:
-                valid_events.append(e)
-            else:
-                print(f"[WARNING] Skipping invalid event: {e}")
-        print(f"[INFO] Loaded {len(valid_events)} valid events from {file_path}")
-        return valid_events
-    except json.JSONDecodeError:
+        with open(file_path, "rb") as f:
+            events = ijson.items(f, "item", use_float=True) if ijson is not None else json.load(f)
+            for e in events:
+                if "team" in e and "player" in e and "points_scored" in e:
+                    valid_count += 1
+                    yield e
+                else:
+                    print(f"[WARNING] Skipping invalid event: {e}")
+    except (json.JSONDecodeError, ValueError):
+        # ijson's JSONError is a ValueError too
         print(f"[ERROR] Failed to parse JSON from {file_path}")
-        return []
+    print(f"[INFO] Loaded {valid_count} valid events from {file_path}")
 
 # ----------------------------
 # Setup plotting (side-by-side)
@@ -58,21 +68,82 @@ fig.text(
     ha="center", va="top", fontsize=9, color="dimgray"
 )
 
-team_scores = defaultdict(list)
-player_scores = defaultdict(lambda: defaultdict(int))
+# Cumulative score per team (row) after each play (column).
+# A game has two teams; the play axis grows as needed.
+# Float so fractional points_scored are kept exactly like player totals.
+MAX_TEAMS = 2
+MAX_PLAYS = 512
+scores = np.zeros((MAX_TEAMS, MAX_PLAYS), dtype=np.float64)
+play_idx = 0
+team_index = {}
+
+player_scores: dict[str, Counter] = {}  # team -> points per player
+top_scorer = {}  # team -> (player, points), updated as points come in
 teams = []
-event_queue = deque()
-momentum = []
+event_iter = iter(())  # events are pulled one per tick, not loaded up front
 
 # ----------------------------
-# Update function
+# Static axes setup (drawn once, not on every frame)
 # ----------------------------
-def update(frame):
-    if not event_queue:
-        return
+ax_score.set_title("Team Scores")
+ax_score.set_xlabel("Play")
+ax_score.set_ylabel("Score")
+ax_score.grid(True, linestyle="--", alpha=0.6)
 
-    event = event_queue.popleft()
-    print(f"[DEBUG] Processing event: {event}")
+ax_momentum.set_title("Momentum: Waiting for 2 Teams")
+ax_momentum.set_xlabel("Play")
+ax_momentum.set_ylabel("Score Difference")
+ax_momentum.grid(True, linestyle="--", alpha=0.6)
+ax_momentum.axhline(0, color="gray", linestyle="--", alpha=0.7)
+
+# Dynamic label explaining the scale
+ax_momentum.text(
+    0.5, 1.02,
+    "",
+    transform=ax_momentum.transAxes,
+    ha="center",
+    va="bottom",
+    fontsize=8,
+    color="gray"
+)
+
+# Persistent artists: one score line and one top-scorer label per team slot
+score_lines = [ax_score.plot([], [], linewidth=2)[0] for _ in range(MAX_TEAMS)]
+top_scorer_texts = [
+    ax_score.text(
+        0.95, 0.85 - 0.05 * i,
+        "",
+        transform=ax_score.transAxes,
+        horizontalalignment='right',
+        fontsize=9
+    )
+    for i in range(MAX_TEAMS)
+]
+momentum_line, = ax_momentum.plot([], [], color="crimson", linewidth=2)
+base_artists = (*score_lines, *top_scorer_texts, momentum_line)
+animated_artists = base_artists
+
+# Current axis limits; changing any of them needs a full redraw
+x_max = 20
+y_max = 10
+y_max_mom = 10
+max_abs_diff = 0
+ax_score.set_xlim(0, x_max)
+ax_score.set_ylim(0, y_max)
+ax_score.set_yticks(range(0, y_max + 1, 10))
+ax_momentum.set_xlim(0, x_max)
+ax_momentum.set_ylim(-y_max_mom, y_max_mom)
+ax_momentum.set_yticks(range(-y_max_mom, y_max_mom + 1, 10))
+
+# ----------------------------
+# Update function
+# ----------------------------
+def apply_event(event):
+    """
+    Update scores, player points and top scorers from one event.
+    Returns (team_id, new_team) or None if the event was skipped.
+    """
+    global scores, play_idx
 
     team = event.get("team")
     player = event.get("player")
@@ -80,112 +151,230 @@ def update(frame):
 
     if not team or points is None:
         print("[WARNING] Invalid event, skipping")
-        return
+        return None
 
-    if team not in teams:
+    new_team = team not in team_index
+    if new_team:
+        if len(teams) >= MAX_TEAMS:
+            print(f"[WARNING] More than {MAX_TEAMS} teams, skipping event for {team}")
+            return None
+        team_index[team] = len(teams)
         teams.append(team)
+    team_id = team_index[team]
 
-    # Update team score
-    prev_score = team_scores[team][-1] if team_scores[team] else 0
-    team_scores[team].append(prev_score + points)
+    # Grow the play axis when full
+    if play_idx == scores.shape[1]:
+        scores = np.concatenate([scores, np.zeros_like(scores)], axis=1)
 
-    # Update player score
-    player_scores[team][player] += points
+    # Carry every team's score forward one play, then add this play's points
+    if play_idx > 0:
+        scores[:, play_idx] = scores[:, play_idx - 1]
+    scores[team_id, play_idx] += points
+    play_idx += 1
 
-    # Ensure all teams have equal-length score arrays
-    for t in teams:
-        if len(team_scores[t]) < len(team_scores[teams[0]]):
-            team_scores[t].append(team_scores[t][-1] if team_scores[t] else 0)
+    # Update player score and the team's top scorer
+    ps = player_scores.get(team)
+    if ps is None:
+        ps = Counter()
+        player_scores[team] = ps
+    ps[player] += points
+    new_pts = ps[player]
+    cur_top = top_scorer.get(team)
+    if cur_top is None or new_pts > cur_top[1]:
+        top_scorer[team] = (player, new_pts)
 
-    # ----------------------------
-    # Plot cumulative scores (Left)
-    # ----------------------------
-    ax_score.clear()
-    ax_score.set_title("Team Scores")
-    ax_score.set_xlabel("Play")
-    ax_score.set_ylabel("Score")
-    ax_score.grid(True, linestyle="--", alpha=0.6)
+    return team_id, new_team
 
-    for t in teams:
-        ax_score.plot(range(len(team_scores[t])), team_scores[t], label=t, linewidth=2)
-    ax_score.legend(loc="upper left")
 
-    # Y-axis scaling in multiples of 10
-    max_score = max([score[-1] for score in team_scores.values()] + [10])
-    y_max = ((max_score // 10) + 1) * 10
-    ax_score.set_ylim(0, y_max)
-    ax_score.set_yticks(range(0, y_max + 1, 10))
+def init():
+    return animated_artists
 
-    # Top player annotations
-    y_offset = 0.05
-    for t in teams:
-        if player_scores[t]:
-            top_player = max(player_scores[t], key=player_scores[t].get)
-            top_points = player_scores[t][top_player]
-            ax_score.text(
-                0.95, 0.9 - y_offset,
-                f"{t} top scorer: {top_player} ({top_points})",
-                transform=ax_score.transAxes,
-                horizontalalignment='right',
-                fontsize=9
-            )
-            y_offset += 0.05
+
+def update(frame):
+    global x_max, y_max, y_max_mom, max_abs_diff, animated_artists
+
+    event = next(event_iter, None)
+    if event is None:
+        return animated_artists
+
+    print(f"[DEBUG] Processing event: {event}")
+
+    applied = apply_event(event)
+    if applied is None:
+        return animated_artists
+    team_id, new_team = applied
+    team = teams[team_id]
+
+    # Static parts (legend, titles, limits) only redraw when something changes
+    full_redraw = False
+
+    if new_team:
+        score_lines[team_id].set_label(team)
+        # The legend sits inside the axes, so blit it with the lines;
+        # a full redraw would not refresh the cached blit background.
+        legend = ax_score.legend(handles=score_lines[:len(teams)], loc="upper left")
+        legend.set_animated(True)
+        animated_artists = (*base_artists, legend)
+        if len(teams) == 2:
+            ax_momentum.set_title(f"Momentum: {teams[0]} - {teams[1]}")
+        full_redraw = True
+
+    top_player, top_points = top_scorer[team]
+    top_scorer_texts[team_id].set_text(f"{team} top scorer: {top_player} ({top_points})")
 
     # ----------------------------
-    # Plot momentum (Right)
+    # Cumulative scores (Left)
     # ----------------------------
-    ax_momentum.clear()
+    plays = np.arange(play_idx)
+    for t in teams:
+        score_lines[team_index[t]].set_data(plays, scores[team_index[t], :play_idx])
 
-    # Dynamic label explaining the scale
-    ax_momentum.text(
-        0.5, 1.02,
-        "",
-        transform=ax_momentum.transAxes,
-        ha="center",
-        va="bottom",
-        fontsize=8,
-        color="gray"
-    )
+    # Double the play axis once the lines reach its end
+    if play_idx > x_max:
+        while play_idx > x_max:
+            x_max *= 2
+        ax_score.set_xlim(0, x_max)
+        ax_momentum.set_xlim(0, x_max)
+        full_redraw = True
 
-    if len(teams) == 2:
-        t1, t2 = teams
-        diff = team_scores[t1][-1] - team_scores[t2][-1]
-        momentum.append(diff)
+    # Y-axis scaling in multiples of 10
+    max_score = max(int(scores[:, play_idx - 1].max()), 10)
+    new_y_max = ((max_score // 10) + 1) * 10
+    if new_y_max != y_max:
+        y_max = new_y_max
+        ax_score.set_ylim(0, y_max)
+        ax_score.set_yticks(range(0, y_max + 1, 10))
+        full_redraw = True
 
-        ax_momentum.set_title(f"Momentum: {t1} - {t2}")
-        ax_momentum.set_xlabel("Play")
-        ax_momentum.set_ylabel("Score Difference")
-        ax_momentum.grid(True, linestyle="--", alpha=0.6)
+    # ----------------------------
+    # Momentum (Right)
+    # ----------------------------
+    max_abs_diff = max(max_abs_diff, abs(int(scores[0, play_idx - 1] - scores[1, play_idx - 1])))
+    if len(teams) == 2:
+        momentum = scores[0, :play_idx] - scores[1, :play_idx]
+        momentum_line.set_data(plays, momentum)
 
         # Y-axis scaling in multiples of 10
-        if momentum:
-            max_diff = max(abs(m) for m in momentum)
-            y_max_mom = ((max_diff // 10) + 1) * 10
+        new_y_max_mom = ((max_abs_diff // 10) + 1) * 10
+        if new_y_max_mom != y_max_mom:
+            y_max_mom = new_y_max_mom
             ax_momentum.set_ylim(-y_max_mom, y_max_mom)
             ax_momentum.set_yticks(range(-y_max_mom, y_max_mom + 1, 10))
+            full_redraw = True
+
+    if full_redraw:
+        fig.canvas.draw()
+
+    return animated_artists
+
+# ----------------------------
+# Fast visualization (pyqtgraph, optional)
+# ----------------------------
+def run_fast_viz():
+    """
+    Show the same score and momentum plots with pyqtgraph.
+    Each tick pushes the current arrays with setData instead of redrawing the canvas.
+    Returns False if pyqtgraph (or a Qt binding) is not installed.
+    """
+    try:
+        import pyqtgraph as pg
+        from pyqtgraph.Qt import QtCore
+    except ImportError as e:
+        print(f"[WARNING] pyqtgraph not available ({e}); using matplotlib.")
+        return False
 
-        ax_momentum.plot(range(len(momentum)), momentum, color="crimson", linewidth=2)
-        ax_momentum.axhline(0, color="gray", linestyle="--", alpha=0.7)
-    else:
-        ax_momentum.set_title("Momentum: Waiting for 2 Teams")
-        ax_momentum.set_xlabel("Event Number")
-        ax_momentum.set_ylabel("Score Difference")
-        ax_momentum.grid(True, linestyle="--", alpha=0.6)
+    app = pg.mkQApp(VIS_TITLE)
+    win = pg.GraphicsLayoutWidget(title=VIS_TITLE)
+
+    score_plot = win.addPlot(title="Team Scores")
+    score_plot.setLabel("bottom", "Play")
+    score_plot.setLabel("left", "Score")
+    score_plot.showGrid(x=True, y=True, alpha=0.3)
+    score_legend = score_plot.addLegend()
+    colors = ["#1f77b4", "#ff7f0e"]
+    curves = [score_plot.plot(pen=pg.mkPen(colors[i], width=2)) for i in range(MAX_TEAMS)]
+
+    momentum_plot = win.addPlot(title="Momentum: Waiting for 2 Teams")
+    momentum_plot.setLabel("bottom", "Play")
+    momentum_plot.setLabel("left", "Score Difference")
+    momentum_plot.showGrid(x=True, y=True, alpha=0.3)
+    momentum_plot.addLine(y=0, pen=pg.mkPen("gray", style=QtCore.Qt.PenStyle.DashLine))
+    momentum_curve = momentum_plot.plot(pen=pg.mkPen("crimson", width=2))
+
+    win.nextRow()
+    top_label = win.addLabel("", colspan=2)
+
+    def step():
+        event = next(event_iter, None)
+        if event is None:
+            timer.stop()
+            return
+        print(f"[DEBUG] Processing event: {event}")
+
+        applied = apply_event(event)
+        if applied is None:
+            return
+        team_id, new_team = applied
+
+        if new_team:
+            score_legend.addItem(curves[team_id], teams[team_id])
+            if len(teams) == 2:
+                momentum_plot.setTitle(f"Momentum: {teams[0]} - {teams[1]}")
+
+        plays = np.arange(play_idx)
+        for t in teams:
+            curves[team_index[t]].setData(plays, scores[team_index[t], :play_idx])
+        if len(teams) == 2:
+            momentum_curve.setData(plays, scores[0, :play_idx] - scores[1, :play_idx])
+
+        top_label.setText(
+            "    ".join(
+                f"{t} top scorer: {top_scorer[t][0]} ({top_scorer[t][1]})" for t in teams
+            )
+        )
+
+    timer = QtCore.QTimer()
+    timer.timeout.connect(step)
+    timer.start(int(MESSAGE_INTERVAL * 1000))
+
+    win.resize(1400, 600)
+    win.show()
+    pg.exec()
+    return True
 
 # ----------------------------
 # Main
 # ----------------------------
 def main():
+    global event_iter
+
+    parser = argparse.ArgumentParser(description="WNBA live game visualization")
+    parser.add_argument(
+        "--fast-viz",
+        action="store_true",
+        help="Plot with pyqtgraph (faster for long games); falls back to matplotlib",
+    )
+    args = parser.parse_args()
+
     print("[INFO] Starting WNBA Consumer (all momentum changes visible)...")
     events = load_game_events(data_file_path)
-    if not events:
+    first = next(events, None)
+    if first is None:
         print("[INFO] No events to visualize. Exiting.")
         return
+    event_iter = chain((first,), events)
 
-    for event in events:
-        event_queue.append(event)
+    if args.fast_viz and run_fast_viz():
+        return
 
-    ani = FuncAnimation(fig, update, interval=MESSAGE_INTERVAL * 1000, cache_frame_data=False)
+    ani = FuncAnimation(
+        fig,
+        update,
+        init_func=init,
+        interval=MESSAGE_INTERVAL * 1000,
+        blit=True,
+        cache_frame_data=False,
+    )
     plt.show()
 
 if __name__ == "__main__":
@@ -1,8 +1,13 @@
 """ sqlite_consumer_case.py 
 
 Has the following functions:
+- get_conn(config): Return a persistent, tuned connection to the SQLite database.
+- close_conn(config): Close the persistent connection (if open).
 - init_db(config): Initialize the SQLite database and create the 'streamed_messages' table if it doesn't exist.
+  Accepts a path or an open connection.
 - insert_message(message, config): Insert a single processed message into the SQLite database.
+  Accepts a path or an open connection.
+- insert_messages_batch(rows, conn): Insert many processed rows in one transaction.
 
 Example JSON message
 {
@@ -30,52 +35,130 @@ import sqlite3
 import utils.utils_config as config
 from utils.utils_logger import logger
 
+#####################################
+# Shared SQL and Connection Cache
+#####################################
+
+# Column order for row tuples passed to INSERT_SQL
+INSERT_COLS = (
+    "message",
+    "author",
+    "timestamp",
+    "category",
+    "sentiment",
+    "keyword_mentioned",
+    "message_length",
+)
+
+# One INSERT statement shared by every insert so sqlite3 can reuse
+# its cached prepared statement on the same connection.
+INSERT_SQL = (
+    f"INSERT INTO streamed_messages ({', '.join(INSERT_COLS)}) "
+    f"VALUES ({', '.join('?' * len(INSERT_COLS))})"
+)
+
+# Persistent connections, one per database file
+_connections: dict = {}
+
+
+#####################################
+# Define Functions to Open / Close a Persistent Connection
+#####################################
+
+
+def get_conn(db_path: pathlib.Path) -> sqlite3.Connection:
+    """
+    Return a persistent connection to the SQLite database,
+    creating and tuning it on first use.
+
+    The connection runs in autocommit mode (isolation_level=None),
+    so callers group writes with explicit BEGIN / COMMIT.
+
+    Args:
+    - db_path (pathlib.Path): Path to the SQLite database file.
+
+    Returns:
+    - sqlite3.Connection: The shared connection for this database file.
+    """
+    STR_PATH = str(db_path)
+    conn = _connections.get(STR_PATH)
+    if conn is None:
+        conn = sqlite3.connect(STR_PATH, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        _connections[STR_PATH] = conn
+        logger.info(f"SUCCESS: Opened persistent SQLite connection to {db_path}.")
+    return conn
+
+
+def close_conn(db_path: pathlib.Path) -> None:
+    """
+    Close the persistent connection for a database file, if one is open.
+
+    Args:
+    - db_path (pathlib.Path): Path to the SQLite database file.
+    """
+    conn = _connections.pop(str(db_path), None)
+    if conn is not None:
+        conn.close()
+        logger.info(f"Closed persistent SQLite connection to {db_path}.")
+
+
 #####################################
 # Define Function to Initialize SQLite Database
 #####################################
 
 
-def init_db(db_path: pathlib.Path):
+def _create_table(conn: sqlite3.Connection) -> None:
+    """Create the 'streamed_messages' table on an open connection if it doesn't exist."""
+    cursor = conn.cursor()
+    logger.info("SUCCESS: Got a cursor to execute SQL.")
+
+    # OCT 2025: Don't drop the table; make idempotent
+    # cursor.execute("DROP TABLE IF EXISTS streamed_messages;")
+
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS streamed_messages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            message TEXT,
+            author TEXT,
+            timestamp TEXT,
+            category TEXT,
+            sentiment REAL,
+            keyword_mentioned TEXT,
+            message_length INTEGER
+        )
+    """
+    )
+    conn.commit()
+
+
+def init_db(target) -> None:
     """
     Initialize the SQLite database -
     if it doesn't exist, create the 'streamed_messages' table
     and if it does, recreate it.
 
     Args:
-    - db_path (pathlib.Path): Path to the SQLite database file.
+    - target (pathlib.Path | sqlite3.Connection): Path to the SQLite database file,
+      or an open connection to reuse.
 
     """
-    logger.info("Calling SQLite init_db() with {db_path=}.")
+    logger.info(f"Calling SQLite init_db() with {target=}.")
     try:
-        # Ensure the directories for the db exist
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
-
-        with sqlite3.connect(db_path) as conn:
-            cursor = conn.cursor()
-            logger.info("SUCCESS: Got a cursor to execute SQL.")
-
-            
-            # OCT 2025: Don't drop the table; make idempotent
-            # cursor.execute("DROP TABLE IF EXISTS streamed_messages;")
-
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS streamed_messages (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    message TEXT,
-                    author TEXT,
-                    timestamp TEXT,
-                    category TEXT,
-                    sentiment REAL,
-                    keyword_mentioned TEXT,
-                    message_length INTEGER
-                )
-            """
-            )
-            conn.commit()
-        logger.info(f"SUCCESS: Database initialized and table ready at {db_path}.")
+        if isinstance(target, sqlite3.Connection):
+            _create_table(target)
+        else:
+            # Ensure the directories for the db exist
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+
+            with sqlite3.connect(target) as conn:
+                _create_table(conn)
+        logger.info(f"SUCCESS: Database initialized and table ready at {target}.")
     except Exception as e:
-        logger.error(f"ERROR: Failed to initialize a sqlite database at {db_path}: {e}")
+        logger.error(f"ERROR: Failed to initialize a sqlite database at {target}: {e}")
 
 
 #####################################
@@ -83,44 +166,88 @@ def init_db(db_path: pathlib.Path):
 #####################################
 
 
-def insert_message(message: dict, db_path: pathlib.Path) -> None:
+def insert_message(message: dict, target) -> None:
     """
     Insert a single processed message into the SQLite database.
 
     Args:
     - message (dict): Processed message to insert.
-    - db_path (pathlib.Path): Path to the SQLite database file.
+    - target (pathlib.Path | sqlite3.Connection): Path to the SQLite database file,
+      or an open connection to reuse.
     """
     logger.info("Calling SQLite insert_message() with:")
     logger.info(f"{message=}")
-    logger.info(f"{db_path=}")
+    logger.info(f"{target=}")
 
-    STR_PATH = str(db_path)
     try:
-        with sqlite3.connect(STR_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO streamed_messages (
-                    message, author, timestamp, category, sentiment, keyword_mentioned, message_length
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    message["message"],
-                    message["author"],
-                    message["timestamp"],
-                    message["category"],
-                    message["sentiment"],
-                    message["keyword_mentioned"],
-                    message["message_length"],
-                ),
-            )
-            conn.commit()
+        row = tuple(message[col] for col in INSERT_COLS)
+        if isinstance(target, sqlite3.Connection):
+            target.execute(INSERT_SQL, row)
+            target.commit()
+        else:
+            with sqlite3.connect(str(target)) as conn:
+                conn.execute(INSERT_SQL, row)
+                conn.commit()
         logger.info("Inserted one message into the database.")
     except Exception as e:
         logger.error(f"ERROR: Failed to insert message into the database: {e}")
 
 
+#####################################
+# Define Function to Insert a Batch of Processed Messages
+#####################################
+
+
+def insert_messages_batch(rows: list, conn: sqlite3.Connection) -> int:
+    """
+    Insert many processed messages into the SQLite database
+    using a single transaction (one commit for the whole batch).
+
+    Args:
+    - rows (list): Row tuples in INSERT_COLS order.
+    - conn (sqlite3.Connection): Open connection, usually from get_conn().
+
+    Returns:
+    - int: Number of rows inserted.
+
+    If the batch fails (e.g. one row has a value SQLite can't bind),
+    it is retried row by row so only the bad rows are skipped.
+    """
+    if not rows:
+        return 0
+
+    try:
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(INSERT_SQL, rows)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        logger.info(f"Inserted {len(rows)} message(s) into the database.")
+        return len(rows)
+    except Exception as e:
+        logger.warning(f"Batch insert failed, retrying row by row: {e}")
+
+    inserted = 0
+    try:
+        conn.execute("BEGIN")
+        for row in rows:
+            try:
+                conn.execute(INSERT_SQL, row)
+                inserted += 1
+            except Exception as e:
+                logger.error(f"ERROR: Skipping message that could not be inserted: {e}")
+        conn.execute("COMMIT")
+    except Exception as e:
+        logger.error(f"ERROR: Failed to insert message batch into the database: {e}")
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        return 0
+    logger.info(f"Inserted {inserted} of {len(rows)} message(s) into the database.")
+    return inserted
+
+
 #####################################
 # Define Function to Delete a Message from the Database
 #####################################
@@ -7,13 +7,17 @@ import os
 import sys
 import json
 import time
-import logging
-from datetime import datetime
 from dotenv import load_dotenv
 
+# Stream events one at a time when ijson is available
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 # Ensure project root is in path so we can import utils
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from utils.utils_producer import send_event
+from utils.utils_producer import send_event, flush_events
 
 
 # ----------------------------
@@ -32,33 +36,57 @@ data_file_path = os.path.join(DATA_DIR, LIVE_DATA_FILE)
 # Helper: Load event data
 # ----------------------------
 def load_game_data(file_path):
-    """Load WNBA game events from a JSON file."""
+    """Yield WNBA game events from a JSON file, parsing one event at a time."""
     if not os.path.exists(file_path):
         print(f"[ERROR] Data file not found: {file_path}")
-        return []
+        return
+
+    with open(file_path, "rb") as f:
+        events = ijson.items(f, "item", use_float=True) if ijson is not None else json.load(f)
+
+        # Normalize event structure
+        for e in events:
+            e["points_scored"] = e.get("points_scored", e.get("points", 0))
+            e.pop("points", None)
+            yield e
+
+
+# ----------------------------
+# Helper: Current timestamp (formatted once per second)
+# ----------------------------
+_last_sec = None
+_last_str = ""
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
 
-    # Normalize event structure
-    for e in data:
-        e["points_scored"] = e.get("points_scored", e.get("points", 0))
-        e.pop("points", None)
-    return data
+def current_timestamp():
+    """Return local time as 'YYYY-MM-DD HH:MM:SS', reformatting only when the second changes."""
+    global _last_sec, _last_str
+    now = int(time.time())
+    if now != _last_sec:
+        _last_sec = now
+        _last_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+    return _last_str
 
 
 # ----------------------------
 # Simulate live streaming
 # ----------------------------
 def stream_events(events, delay=3):
-    """Simulate sending live WNBA game events with a time delay."""
+    """
+    Simulate sending live WNBA game events with a time delay.
+    Returns the number of events sent.
+    """
+    sent = 0
     for event in events:
-        event["timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        event["timestamp"] = current_timestamp()
         event["points_scored"] = event.get("points_scored", 0)
 
         send_event(event, delay=delay)
         print(f"[INFO] Sent event: {event}")
+        sent += 1
         time.sleep(delay)
+    flush_events()
+    return sent
 
 
 # ----------------------------
@@ -68,13 +96,13 @@ def main():
     print("[INFO] Starting WNBA Producer...")
     print(f"[INFO] Streaming events from: {data_file_path}")
 
-    events = load_game_data(data_file_path)
-    if not events:
+    # Events are parsed lazily, so the first one is sent before the file is fully read
+    sent = stream_events(load_game_data(data_file_path), MESSAGE_INTERVAL)
+    if not sent:
         print("[ERROR] No events to stream. Exiting.")
         return
 
-    print(f"[INFO] Loaded {len(events)} events from {data_file_path}")
-    stream_events(events, MESSAGE_INTERVAL)
+    print(f"[INFO] Streamed {sent} events from {data_file_path}")
 
 
 # ----------------------------
@@ -5,34 +5,51 @@ Minimal tests for consumer idempotency.
 """
 
 import json
+import os
 import pathlib
 import sqlite3
+import threading
+import types
 import pytest
 
-from consumers.sqlite_consumer_case import init_db, insert_message
+from consumers import file_consumer_case
+from consumers.file_consumer_case import (
+    LiveFileHandler,
+    _consume_loop,
+    process_buffer,
+    process_message,
+)
+from consumers.sqlite_consumer_case import (
+    init_db,
+    insert_message,
+    insert_messages_batch,
+)
 
 
-def test_init_db_is_idempotent(tmp_path: pathlib.Path):
+@pytest.fixture
+def conn(tmp_path: pathlib.Path):
+    """One SQLite connection shared by everything in a test."""
+    c = sqlite3.connect(tmp_path / "test.sqlite")
+    yield c
+    c.close()
+
+
+def test_init_db_is_idempotent(conn: sqlite3.Connection):
     """Verify init_db can be called multiple times without error."""
-    db_path = tmp_path / "test.sqlite"
-    
     # Call twice - should not fail
-    init_db(db_path)
-    init_db(db_path)  # Second call should be safe
-    
+    init_db(conn)
+    init_db(conn)  # Second call should be safe
+
     # Verify table exists
-    with sqlite3.connect(db_path) as conn:
-        cur = conn.cursor()
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='streamed_messages';")
-        assert cur.fetchone() is not None
+    cur = conn.cursor()
+    cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='streamed_messages';")
+    assert cur.fetchone() is not None
 
 
-def test_init_db_preserves_data(tmp_path: pathlib.Path):
+def test_init_db_preserves_data(conn: sqlite3.Connection):
     """Verify init_db doesn't drop existing data."""
-    db_path = tmp_path / "test.sqlite"
-    
     # Initialize and insert a message
-    init_db(db_path)
+    init_db(conn)
     msg = {
         "message": "test",
         "author": "A",
@@ -42,24 +59,22 @@ def test_init_db_preserves_data(tmp_path: pathlib.Path):
         "keyword_mentioned": "k",
         "message_length": 4,
     }
-    insert_message(msg, db_path)
-    
+    insert_message(msg, conn)
+
     # Call init_db again
-    init_db(db_path)
-    
+    init_db(conn)
+
     # Verify data still exists
-    with sqlite3.connect(db_path) as conn:
-        cur = conn.cursor()
-        cur.execute("SELECT COUNT(*) FROM streamed_messages;")
-        count = cur.fetchone()[0]
-        assert count == 1, "init_db should not drop existing data"
+    cur = conn.cursor()
+    cur.execute("SELECT COUNT(*) FROM streamed_messages;")
+    count = cur.fetchone()[0]
+    assert count == 1, "init_db should not drop existing data"
 
 
-def test_insert_message_appends(tmp_path: pathlib.Path):
+def test_insert_message_appends(conn: sqlite3.Connection):
     """Verify insert_message appends without deleting prior data."""
-    db_path = tmp_path / "test.sqlite"
-    init_db(db_path)
-    
+    init_db(conn)
+
     msg1 = {
         "message": "first",
         "author": "A",
@@ -78,12 +93,225 @@ def test_insert_message_appends(tmp_path: pathlib.Path):
         "keyword_mentioned": "k2",
         "message_length": 6,
     }
-    
-    insert_message(msg1, db_path)
-    insert_message(msg2, db_path)
-    
-    with sqlite3.connect(db_path) as conn:
-        cur = conn.cursor()
+
+    insert_message(msg1, conn)
+    insert_message(msg2, conn)
+
+    cur = conn.cursor()
+    cur.execute("SELECT COUNT(*) FROM streamed_messages;")
+    count = cur.fetchone()[0]
+    assert count == 2
+
+
+def test_insert_message_logs_missing_fields(conn: sqlite3.Connection):
+    """Verify a message missing fields is logged and skipped, not raised."""
+    init_db(conn)
+    insert_message({"message": "m"}, conn)
+
+    cur = conn.cursor()
+    cur.execute("SELECT COUNT(*) FROM streamed_messages;")
+    assert cur.fetchone()[0] == 0
+
+
+def test_init_db_and_insert_message_accept_path(tmp_path: pathlib.Path):
+    """Verify init_db and insert_message still work when given a database path."""
+    db_path = tmp_path / "test.sqlite"
+    init_db(db_path)
+    insert_message(
+        {
+            "message": "by path",
+            "author": "A",
+            "timestamp": "2025-01-01 00:00:00",
+            "category": "x",
+            "sentiment": 0.5,
+            "keyword_mentioned": "k",
+            "message_length": 7,
+        },
+        db_path,
+    )
+
+    with sqlite3.connect(db_path) as c:
+        cur = c.cursor()
         cur.execute("SELECT COUNT(*) FROM streamed_messages;")
-        count = cur.fetchone()[0]
-        assert count == 2
\ No newline at end of file
+        assert cur.fetchone()[0] == 1
+
+
+def test_insert_messages_batch_inserts_all(conn: sqlite3.Connection):
+    """Verify insert_messages_batch writes every row in one call."""
+    init_db(conn)
+
+    rows = [
+        (f"msg {i}", "A", "2025-01-01 00:00:00", "x", 0.5, "k", 5)
+        for i in range(3)
+    ]
+
+    assert insert_messages_batch(rows, conn) == 3
+    assert insert_messages_batch([], conn) == 0
+
+    cur = conn.cursor()
+    cur.execute("SELECT COUNT(*) FROM streamed_messages;")
+    count = cur.fetchone()[0]
+    assert count == 3
+
+
+def test_insert_messages_batch_skips_only_bad_rows(conn: sqlite3.Connection):
+    """Verify one unbindable row doesn't discard the good rows in its batch."""
+    init_db(conn)
+
+    good = ("m", "A", "2025-01-01 00:00:00", "x", 0.5, "k", 1)
+    bad = ("m", {"name": "A"}, "2025-01-01 00:00:00", "x", 0.5, "k", 1)
+    rows = [good] * 5 + [bad] + [good] * 5
+
+    assert insert_messages_batch(rows, conn) == 10
+
+    cur = conn.cursor()
+    cur.execute("SELECT COUNT(*) FROM streamed_messages;")
+    assert cur.fetchone()[0] == 10
+
+
+def test_process_message_fills_missing_fields():
+    """Verify complete messages map straight to a row and missing fields get defaults."""
+    full = {
+        "message": "m",
+        "author": "A",
+        "timestamp": "2025-01-01 00:00:00",
+        "category": "x",
+        "sentiment": "0.5",
+        "keyword_mentioned": "k",
+        "message_length": "1",
+    }
+    assert process_message(full) == ("m", "A", "2025-01-01 00:00:00", "x", 0.5, "k", 1)
+    assert process_message({"message": "m"}) == ("m", None, None, None, 0.0, None, 0)
+
+
+def test_process_buffer_skips_blank_and_invalid_lines(conn: sqlite3.Connection):
+    """Verify process_buffer stores valid lines and skips blank or malformed ones."""
+    init_db(conn)
+    msg = {
+        "message": "m",
+        "author": "A",
+        "timestamp": "2025-01-01 00:00:00",
+        "category": "x",
+        "sentiment": 0.5,
+        "keyword_mentioned": "k",
+        "message_length": 1,
+    }
+    line = json.dumps(msg).encode("utf-8")
+    buf = line + b"\n\n  \nnot json\n" + line + b"\n"
+
+    count = process_buffer(buf, lambda rows: insert_messages_batch(rows, conn))
+    assert count == 2
+
+    cur = conn.cursor()
+    cur.execute("SELECT COUNT(*) FROM streamed_messages;")
+    assert cur.fetchone()[0] == 2
+
+
+def test_process_buffer_skips_invalid_utf8_with_stdlib_json(conn: sqlite3.Connection):
+    """Verify a non-UTF-8 line is skipped when falling back to json.loads."""
+    init_db(conn)
+    msg = {
+        "message": "m",
+        "author": "A",
+        "timestamp": "2025-01-01 00:00:00",
+        "category": "x",
+        "sentiment": 0.5,
+        "keyword_mentioned": "k",
+        "message_length": 1,
+    }
+    line = json.dumps(msg).encode("utf-8")
+    buf = line + b"\n\xff\n" + line + b"\n"
+
+    count = process_buffer(buf, lambda rows: insert_messages_batch(rows, conn), loads=json.loads)
+    assert count == 2
+
+
+def test_process_buffer_skips_deeply_nested_line_with_stdlib_json(conn: sqlite3.Connection):
+    """Verify a line nested past the recursion limit is skipped, not raised."""
+    init_db(conn)
+    deep = b"[" * 100_000 + b"]" * 100_000
+    buf = deep + b"\n"
+
+    count = process_buffer(buf, lambda rows: insert_messages_batch(rows, conn), loads=json.loads)
+    assert count == 0
+
+
+@pytest.mark.parametrize("hook", ["on_modified", "on_created"])
+def test_live_file_handler_sets_event_only_for_live_file(tmp_path: pathlib.Path, hook):
+    """Verify the watcher wakes the consumer for the live file and ignores other files."""
+    live = tmp_path / "live.jsonl"
+    changed = threading.Event()
+    handler = LiveFileHandler(live, changed)
+
+    getattr(handler, hook)(types.SimpleNamespace(src_path=str(tmp_path / "other.jsonl")))
+    assert not changed.is_set()
+
+    getattr(handler, hook)(types.SimpleNamespace(src_path=str(live)))
+    assert changed.is_set()
+
+
+class _StopLoop(BaseException):
+    """Raised from wait_for_change to end the consumer loop (not caught as Exception)."""
+
+
+@pytest.mark.parametrize("chunk_bytes", [1 << 22, 7])
+def test_consume_loop_handles_partial_lines_truncation_and_replacement(
+    tmp_path: pathlib.Path, conn: sqlite3.Connection, monkeypatch, chunk_bytes
+):
+    """Drive _consume_loop through appends, a truncate, a replace and a recreate."""
+    # A small chunk size makes every line span several reads
+    monkeypatch.setattr(file_consumer_case, "CHUNK_BYTES", chunk_bytes)
+    init_db(conn)
+    live = tmp_path / "live.jsonl"
+    line = json.dumps(
+        {
+            "message": "m",
+            "author": "A",
+            "timestamp": "2025-01-01 00:00:00",
+            "category": "x",
+            "sentiment": 0.5,
+            "keyword_mentioned": "k",
+            "message_length": 1,
+        }
+    )
+
+    def count():
+        return conn.execute("SELECT COUNT(*) FROM streamed_messages;").fetchone()[0]
+
+    def append(text):
+        with open(live, "a", encoding="utf-8") as f:
+            f.write(text)
+
+    def replace(text):
+        new = tmp_path / "new.jsonl"
+        new.write_text(text, encoding="utf-8")
+        os.replace(new, live)
+
+    # Two full lines plus the first half of a third
+    half = len(line) // 2
+    live.write_text(line + "\n" + line + "\n" + line[:half], encoding="utf-8")
+
+    # Each step checks the rows stored so far, then changes the file
+    steps = [
+        (2, lambda: append(line[half:] + "\n")),  # finish the partial line
+        (3, lambda: live.write_text(line + "\n", encoding="utf-8")),  # truncate in place
+        (4, lambda: replace(line + "\n" + line + "\n")),  # new inode
+        (6, lambda: live.unlink()),  # delete ...
+        (6, lambda: live.write_text(line + "\n", encoding="utf-8")),  # ... and recreate
+        (7, None),
+    ]
+
+    # Record counts and compare after the loop: the loop catches Exception,
+    # so an assert inside wait_for_change would be swallowed.
+    seen = []
+
+    def wait_for_change():
+        seen.append(count())
+        action = steps[len(seen) - 1][1]
+        if action is None:
+            raise _StopLoop
+        action()
+
+    with pytest.raises(_StopLoop):
+        _consume_loop(live, conn, 0, 0, wait_for_change)
+    assert seen == [expected for expected, _ in steps]
@@ -0,0 +1,76 @@
+"""
+tests/test_game_consumer.py
+
+Tests for the game consumer's score bookkeeping (apply_event).
+"""
+
+import matplotlib
+
+matplotlib.use("Agg")  # the module builds a figure on import
+
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from consumers import game_consumer
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    """Give every test empty score state."""
+    monkeypatch.setattr(
+        game_consumer,
+        "scores",
+        np.zeros((game_consumer.MAX_TEAMS, game_consumer.MAX_PLAYS), dtype=np.float64),
+    )
+    monkeypatch.setattr(game_consumer, "play_idx", 0)
+    monkeypatch.setattr(game_consumer, "team_index", {})
+    monkeypatch.setattr(game_consumer, "teams", [])
+    monkeypatch.setattr(game_consumer, "player_scores", {})
+    monkeypatch.setattr(game_consumer, "top_scorer", {})
+
+
+def _event(team, player, points):
+    return {"team": team, "player": player, "points_scored": points}
+
+
+def test_apply_event_carries_scores_forward():
+    assert game_consumer.apply_event(_event("Aces", "Plum", 2)) == (0, True)
+    assert game_consumer.apply_event(_event("Mercury", "Taurasi", 3)) == (1, True)
+    assert game_consumer.apply_event(_event("Aces", "Wilson", 2)) == (0, False)
+
+    played = game_consumer.scores[:, : game_consumer.play_idx]
+    assert played.tolist() == [[2, 2, 4], [0, 3, 3]]
+    assert game_consumer.top_scorer == {"Aces": ("Plum", 2), "Mercury": ("Taurasi", 3)}
+
+
+def test_apply_event_keeps_fractional_points():
+    game_consumer.apply_event(_event("Aces", "Plum", 2.5))
+    game_consumer.apply_event(_event("Aces", "Plum", 1))
+
+    assert game_consumer.scores[0, game_consumer.play_idx - 1] == 3.5
+    assert game_consumer.player_scores["Aces"] == Counter({"Plum": 3.5})
+
+
+def test_apply_event_grows_play_axis():
+    plays = game_consumer.MAX_PLAYS + 3
+    for _ in range(plays):
+        game_consumer.apply_event(_event("Aces", "Plum", 1))
+
+    assert game_consumer.play_idx == plays
+    assert game_consumer.scores.shape[1] == 2 * game_consumer.MAX_PLAYS
+    assert game_consumer.scores[0, plays - 1] == plays
+
+
+def test_apply_event_skips_third_team_and_invalid_events():
+    game_consumer.apply_event(_event("Aces", "Plum", 2))
+    game_consumer.apply_event(_event("Mercury", "Taurasi", 3))
+
+    assert game_consumer.apply_event(_event("Liberty", "Stewart", 2)) is None
+    assert game_consumer.apply_event(_event(None, "Nobody", 2)) is None
+    assert game_consumer.apply_event(_event("Aces", "Plum", None)) is None
+
+    assert game_consumer.play_idx == 2
+    assert game_consumer.teams == ["Aces", "Mercury"]
+    assert "Liberty" not in game_consumer.player_scores
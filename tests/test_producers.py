@@ -0,0 +1,136 @@
+"""
+tests/test_producers.py
+
+Tests for producer event encoding without orjson (template / json.dumps paths)
+and for how send_event writes to stdout; plus the producer's cached timestamp.
+"""
+
+import contextlib
+import datetime
+import io
+import json
+import pathlib
+import subprocess
+import sys
+import pytest
+
+from producers import game_producer
+from utils import utils_producer
+from utils.utils_producer import encode_event
+
+
+@pytest.fixture(autouse=True)
+def no_orjson(monkeypatch):
+    """Force the pure-Python encoders."""
+    monkeypatch.setattr(utils_producer, "orjson", None)
+
+
+def _event(**overrides):
+    event = {
+        "timestamp": "2025-10-04 19:00:00",
+        "game": "Mercury vs Aces",
+        "team": "Aces",
+        "player": "Kelsey Plum",
+        "points_scored": 2,
+        "message": "Kelsey Plum hits a jumper.",
+    }
+    event.update(overrides)
+    return event
+
+
+def test_encode_event_plain_uses_template():
+    e = _event()
+    out = encode_event(e)
+    assert out.endswith(b"\n")
+    assert json.loads(out) == e
+    assert b", " not in out  # compact template output, not json.dumps
+
+
+def test_encode_event_non_ascii_name():
+    e = _event(player="A’ja Wilson", message="A’ja Wilson hits a jumper to start the game!")
+    out = encode_event(e)
+    assert json.loads(out) == e
+    assert "A’ja Wilson".encode("utf-8") in out
+
+
+@pytest.mark.parametrize(
+    "message",
+    ['She said "and one!"', "back\\slash", "tab\there", "line\nbreak"],
+)
+def test_encode_event_escapes_special_characters(message):
+    e = _event(message=message)
+    out = encode_event(e)
+    assert out.count(b"\n") == 1
+    assert json.loads(out) == e
+
+
+@pytest.mark.parametrize("points", [True, 2.5, None, "2"])
+def test_encode_event_non_int_points(points):
+    e = _event(points_scored=points)
+    assert json.loads(encode_event(e)) == e
+
+
+def test_encode_event_extra_key():
+    e = _event(quarter=1)
+    assert json.loads(encode_event(e)) == e
+
+
+def test_encode_event_non_string_value():
+    e = _event(player=None)
+    assert json.loads(encode_event(e)) == e
+
+
+def test_send_event_keeps_order_with_print_output():
+    """Event lines and print output reach a pipe in the order they were written."""
+    root = pathlib.Path(__file__).resolve().parents[1]
+    code = (
+        "from utils.utils_producer import send_event\n"
+        "print('before')\n"
+        "send_event({'i': 1})\n"
+        "print('after')\n"
+        "send_event({'i': 2})\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True
+    )
+    lines = result.stdout.splitlines()
+    lines = lines[lines.index("before"):]
+    assert [l.replace(" ", "") for l in lines] == ["before", '{"i":1}', "after", '{"i":2}']
+
+
+def test_send_event_with_redirected_stdout():
+    """Events still come out when stdout has no binary buffer."""
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        utils_producer.send_event(_event())
+    lines = buf.getvalue().splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0]) == _event()
+
+
+def test_current_timestamp_reformats_only_when_second_changes(monkeypatch):
+    """Calls within one second reuse the cached string; the format matches datetime's."""
+    now = [1_700_000_000.1]
+    formatted = []
+    strftime = game_producer.time.strftime
+
+    def counting_strftime(fmt, t):
+        formatted.append(t)
+        return strftime(fmt, t)
+
+    monkeypatch.setattr(game_producer.time, "time", lambda: now[0])
+    monkeypatch.setattr(game_producer.time, "strftime", counting_strftime)
+    monkeypatch.setattr(game_producer, "_last_sec", None)
+
+    first = game_producer.current_timestamp()
+    now[0] += 0.5
+    assert game_producer.current_timestamp() == first
+    assert len(formatted) == 1
+
+    now[0] += 1
+    second = game_producer.current_timestamp()
+    assert len(formatted) == 2
+    assert second != first
+
+    expected = datetime.datetime.fromtimestamp(int(now[0])).strftime("%Y-%m-%d %H:%M:%S")
+    assert second == expected
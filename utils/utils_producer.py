@@ -1,16 +1,91 @@
 # utils/utils_producer.py
 
 import json
+import sys
 import time
 
+# Faster JSON encoding when available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 print("utils_producer.py loaded")  # confirms correct file is being used
 
+# Flush buffered events to stdout after this many sends (or on any delay)
+FLUSH_EVERY = 100
+
+_pending = 0
+
+# Known WNBA event schema, serialized with a fixed template when orjson is missing
+EVENT_KEYS = frozenset(
+    ("timestamp", "game", "team", "player", "points_scored", "message")
+)
+EVENT_TEMPLATE = (
+    '{"timestamp":"%s","game":"%s","team":"%s","player":"%s",'
+    '"points_scored":%d,"message":"%s"}\n'
+)
+
+
+def flush_events():
+    """Push any buffered events (and text) out to stdout."""
+    global _pending
+    sys.stdout.flush()
+    _pending = 0
+
+
+def encode_event(event):
+    """
+    Encode one event as a UTF-8 JSON line.
+
+    Uses orjson when installed. Otherwise events with the known schema and plain
+    text values (nothing JSON would escape) go through EVENT_TEMPLATE, and
+    anything else falls back to json.dumps.
+    """
+    if orjson is not None:
+        return orjson.dumps(event, option=orjson.OPT_APPEND_NEWLINE)
+
+    if event.keys() == EVENT_KEYS and type(event["points_scored"]) is int:
+        values = (
+            event["timestamp"],
+            event["game"],
+            event["team"],
+            event["player"],
+            event["points_scored"],
+            event["message"],
+        )
+        try:
+            text = "".join(values[:4]) + values[5]
+        except TypeError:
+            text = None  # a non-string value
+        if text is not None and text.isprintable() and '"' not in text and "\\" not in text:
+            return (EVENT_TEMPLATE % values).encode("utf-8")
+
+    return json.dumps(event).encode("utf-8") + b"\n"
+
+
 def send_event(event, delay=0):
     """
-    Send a single WNBA game event (currently prints to console).
+    Send a single WNBA game event (currently writes a JSON line to the console).
+
+    Encoded bytes go into stdout's own binary buffer after any pending text,
+    so output stays in order. Events are flushed
+    every FLUSH_EVERY sends, or right away when delay > 0. Falls back to print
+    when stdout has no binary buffer (e.g. redirected to a StringIO).
     """
+    global _pending
     try:
-        print(json.dumps(event))
+        line = encode_event(event)
+        out = getattr(sys.stdout, "buffer", None)
+        if out is not None:
+            # Flush pending text first so output stays in order
+            sys.stdout.flush()
+            out.write(line)
+        else:
+            print(line.decode("utf-8"), end="")
+        _pending += 1
+        if delay > 0 or _pending >= FLUSH_EVERY:
+            flush_events()
         if delay > 0:
             time.sleep(delay)
     except Exception as e: